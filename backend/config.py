@@ -11,9 +11,10 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30 * 24 * 60  # 30 days
     BASE_URL: str = "http://localhost:8000"
-    
+
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./content_platform.db"
+    SQL_ECHO: bool = False  # Log every SQL statement (debugging only)
     
     # AWS S3 Settings
     AWS_ACCESS_KEY_ID: Optional[str] = None
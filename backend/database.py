@@ -1,9 +1,24 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from config import settings
 
-# Create async engine
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+# Create async engine (SQL echo is off by default; enable via SQL_ECHO for debugging)
+engine = create_async_engine(settings.DATABASE_URL, echo=settings.SQL_ECHO)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, connection_record):
+        """Tune SQLite for concurrent reads: WAL journaling, relaxed fsync,
+        in-memory temp tables and a 64MB page cache."""
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
 
 # Create async session maker
 async_session = async_sessionmaker(engine, expire_on_commit=False)
@@ -15,18 +15,34 @@ from models import Base
 from config import settings
 from sqlalchemy.ext.asyncio import create_async_engine
 
+# Indexes for the hot query paths. IF NOT EXISTS also migrates databases
+# created before these indexes were added to the models.
+HOT_PATH_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_content_active_created ON content (is_active, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_content_creator_active ON content (creator_id, is_active)",
+    "CREATE INDEX IF NOT EXISTS ix_content_expires_at ON content (expires_at)",
+    "CREATE INDEX IF NOT EXISTS ix_payments_payway_transaction_id ON payments (payway_transaction_id)",
+    "CREATE INDEX IF NOT EXISTS ix_payment_user_content_status ON payments (user_id, content_id, status)",
+    "CREATE INDEX IF NOT EXISTS ix_earnings_creator_paid_out ON earnings (creator_id, paid_out)",
+    "CREATE INDEX IF NOT EXISTS ix_earnings_week ON earnings (week_start, week_end, paid_out)",
+]
+
 async def create_tables():
     """Create all database tables"""
     print("Creating database tables...")
-    
+
     # Create engine
-    engine = create_async_engine(settings.DATABASE_URL, echo=True)
-    
+    engine = create_async_engine(settings.DATABASE_URL, echo=settings.SQL_ECHO)
+
     try:
         async with engine.begin() as conn:
             # Create all tables
             await conn.run_sync(Base.metadata.create_all)
-        
+
+            # Ensure indexes exist on databases created by older versions
+            for statement in HOT_PATH_INDEXES:
+                await conn.exec_driver_sql(statement)
+
         print("SUCCESS: Database tables created successfully!")
         
     except Exception as e:
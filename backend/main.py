@@ -1,20 +1,25 @@
 from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, status, BackgroundTasks
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import selectinload
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, update, and_, func, exists
+from sqlalchemy.exc import IntegrityError
 from contextlib import asynccontextmanager
 import os
+import re
 import uuid
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
 import pandas as pd
 from datetime import datetime, timedelta, date
 from typing import List, Optional
 import asyncio
 import aiofiles
-import requests
+import httpx
+from cachetools import TTLCache
 from io import BytesIO
 import json
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -22,8 +27,9 @@ import atexit
 
 from models import User, Content, Payment, Earnings, Base
 from schemas import (
-    UserCreate, UserResponse, UserLogin, ContentCreate, ContentResponse, 
-    PaymentCreate, PaymentResponse, EarningsResponse, ContentUpload
+    UserCreate, UserResponse, UserLogin, ContentCreate, ContentResponse,
+    PaymentCreate, PaymentResponse, EarningsResponse, ContentUpload,
+    PresignRequest, PresignResponse
 )
 from auth import create_access_token, verify_password, get_password_hash, get_current_user
 from config import settings
@@ -31,21 +37,31 @@ from config import settings
 # Initialize scheduler for background tasks
 scheduler = AsyncIOScheduler()
 
+# Shared async HTTP client for outbound API calls (created on startup)
+http_client: httpx.AsyncClient = None
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    global http_client
+    http_client = httpx.AsyncClient(
+        timeout=30,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
     scheduler.start()
     scheduler.add_job(cleanup_expired_content, "cron", hour=2)  # Run at 2 AM daily
     yield
     # Shutdown
     scheduler.shutdown()
+    await http_client.aclose()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Content Platform API",
     description="A platform for creators to upload and monetize audio/video content",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -65,22 +81,65 @@ s3_client = boto3.client(
     's3',
     aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
     aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name=settings.AWS_REGION
+    region_name=settings.AWS_REGION,
+    # Enough pooled connections for concurrent multipart uploads, with
+    # adaptive retries to smooth out S3 throttling tails
+    config=BotoConfig(
+        max_pool_connections=64,
+        retries={"max_attempts": 5, "mode": "adaptive"},
+        tcp_keepalive=True
+    )
+)
+
+# Multipart transfer config: parallel part uploads, bounded memory per upload
+s3_transfer_config = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
 )
 
 # OAuth2 setup
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Short-TTL cache for the public content listing, invalidated on writes
+content_list_cache = TTLCache(maxsize=256, ttl=30)
+
+# Per-item cache for content detail pages; content is effectively immutable
+# apart from counters, so a few seconds of staleness is fine
+content_detail_cache = TTLCache(maxsize=1024, ttl=10)
+
+# Allowed upload MIME types, precomputed from settings
+ALLOWED_AUDIO_TYPES = frozenset(settings.ALLOWED_AUDIO_TYPES)
+ALLOWED_UPLOAD_TYPES = ALLOWED_AUDIO_TYPES | frozenset(settings.ALLOWED_VIDEO_TYPES)
+ALLOWED_UPLOAD_EXTENSIONS = frozenset({'mp3', 'wav', 'ogg', 'mp4', 'mov', 'avi', 'webm'})
+
+# Shape of keys minted by make_upload_key: 32 hex chars plus an allowed
+# extension; anything else in a client-supplied s3_key is rejected
+UPLOAD_KEY_PATTERN = re.compile(
+    r'^[0-9a-f]{32}\.(' + '|'.join(sorted(ALLOWED_UPLOAD_EXTENSIONS)) + r')$'
+)
+
 # Utility functions
+def make_upload_key(filename: str) -> str:
+    """Build a unique S3 key from an upload's filename, validating the extension"""
+    extension = os.path.splitext(filename or "")[1].lstrip('.').lower()
+    if extension not in ALLOWED_UPLOAD_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Unsupported file extension")
+    return f"{uuid.uuid4().hex}.{extension}"
+
 async def upload_to_s3(file: UploadFile, filename: str) -> str:
-    """Upload file to AWS S3 and return the URL"""
+    """Stream file to AWS S3 as a multipart upload and return the URL"""
     try:
-        file_content = await file.read()
-        s3_client.put_object(
-            Bucket=settings.S3_BUCKET,
-            Key=filename,
-            Body=file_content,
-            ContentType=file.content_type
+        # file.file is a SpooledTemporaryFile, so upload_fileobj streams it
+        # part-by-part instead of buffering the whole upload in memory
+        await asyncio.to_thread(
+            s3_client.upload_fileobj,
+            file.file,
+            settings.S3_BUCKET,
+            filename,
+            ExtraArgs={"ContentType": file.content_type},
+            Config=s3_transfer_config
         )
         return f"https://{settings.S3_BUCKET}.s3.amazonaws.com/{filename}"
     except Exception as e:
@@ -101,8 +160,8 @@ async def process_payway_payment(user_id: int, content_id: str, amount: float, p
     }
     
     try:
-        response = requests.post(f"{settings.PAYWAY_API_URL}/payments", 
-                               json=payload, headers=headers, timeout=30)
+        response = await http_client.post(f"{settings.PAYWAY_API_URL}/payments",
+                                          json=payload, headers=headers)
         return response.json()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Payment processing failed: {str(e)}")
@@ -112,39 +171,56 @@ async def cleanup_expired_content():
     async with async_session() as session:
         # Get expired content
         result = await session.execute(
-            select(Content).where(
+            select(Content.id, Content.file_url).where(
                 and_(Content.expires_at < datetime.utcnow(), Content.is_active == True)
             )
         )
-        expired_content = result.scalars().all()
-        
-        for content in expired_content:
-            # Delete from S3
-            try:
-                filename = content.file_url.split('/')[-1]
-                s3_client.delete_object(Bucket=settings.S3_BUCKET, Key=filename)
-            except Exception as e:
-                print(f"Error deleting {content.id} from S3: {e}")
-            
-            # Mark as inactive
-            content.is_active = False
-        
+        expired_content = result.all()
+
+        if not expired_content:
+            return
+
+        content_ids = [content_id for content_id, _ in expired_content]
+        keys = [file_url.rsplit('/', 1)[-1] for _, file_url in expired_content]
+
+        # Batch-delete from S3 (up to 1000 keys per call), chunks in parallel
+        # with bounded concurrency so a huge backlog can't exhaust the
+        # connection pool or S3 rate limits
+        semaphore = asyncio.Semaphore(16)
+
+        async def _delete_chunk(chunk):
+            async with semaphore:
+                try:
+                    await asyncio.to_thread(
+                        s3_client.delete_objects,
+                        Bucket=settings.S3_BUCKET,
+                        Delete={"Objects": [{"Key": key} for key in chunk], "Quiet": True}
+                    )
+                except Exception as e:
+                    print(f"Error deleting expired content from S3: {e}")
+
+        chunks = [keys[i:i + 1000] for i in range(0, len(keys), 1000)]
+        await asyncio.gather(
+            *[_delete_chunk(chunk) for chunk in chunks], return_exceptions=True
+        )
+
+        # Mark all expired content inactive in one statement
+        await session.execute(
+            update(Content).where(Content.id.in_(content_ids)).values(is_active=False)
+        )
         await session.commit()
 
+        # Expired content changes the public listing and detail pages
+        content_list_cache.clear()
+        content_detail_cache.clear()
+
 # Authentication endpoints
 @app.post("/auth/register", response_model=UserResponse)
 async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
-    # Check if user exists
-    result = await db.execute(select(User).where(User.username == user_data.username))
-    if result.scalar_one_or_none():
-        raise HTTPException(status_code=400, detail="Username already registered")
-    
-    result = await db.execute(select(User).where(User.email == user_data.email))
-    if result.scalar_one_or_none():
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    # Create new user; the UNIQUE constraints on username/email catch
+    # duplicates atomically instead of two preliminary SELECTs.
+    # bcrypt takes ~100ms, so hash on a worker thread to keep the loop free
+    hashed_password = await asyncio.to_thread(get_password_hash, user_data.password)
     db_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -153,11 +229,17 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
         creator_name=user_data.creator_name,
         phone_number=user_data.phone_number
     )
-    
+
     db.add(db_user)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if "username" in str(e.orig):
+            raise HTTPException(status_code=400, detail="Username already registered")
+        raise HTTPException(status_code=400, detail="Email already registered")
     await db.refresh(db_user)
-    
+
     return UserResponse(
         id=db_user.id,
         username=db_user.username,
@@ -173,7 +255,9 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
     result = await db.execute(select(User).where(User.username == form_data.username))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not user or not await asyncio.to_thread(
+        verify_password, form_data.password, user.password_hash
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -196,71 +280,136 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
     )
 
 # Content endpoints
-@app.get("/api/content", response_model=List[ContentResponse])
+@app.get("/api/content", response_model=None)
 async def get_content(
-    skip: int = 0, 
-    limit: int = 20, 
+    skip: int = 0,
+    limit: int = 20,
     db: AsyncSession = Depends(get_db)
-):
+) -> List[dict]:
+    cache_key = (skip, limit)
+    cached = content_list_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Project only the columns the response needs instead of hydrating
+    # full Content and User objects per row
     result = await db.execute(
-        select(Content)
-        .options(selectinload(Content.creator))
+        select(
+            Content.id,
+            Content.title,
+            Content.description,
+            Content.file_url,
+            Content.file_type,
+            Content.price,
+            Content.views,
+            Content.created_at,
+            Content.expires_at,
+            User.creator_name,
+            User.username
+        )
+        .join(User, User.id == Content.creator_id)
         .where(Content.is_active == True)
         .order_by(Content.created_at.desc())
         .offset(skip)
         .limit(limit)
     )
-    content_items = result.scalars().all()
-    
-    return [
-        ContentResponse(
-            id=item.id,
-            title=item.title,
-            description=item.description,
-            file_url=item.file_url,
-            file_type=item.file_type,
-            creator_name=item.creator.creator_name or item.creator.username,
-            price=item.price,
-            views=item.views,
-            created_at=item.created_at,
-            expires_at=item.expires_at
-        )
-        for item in content_items
+
+    response = [
+        {
+            "id": row.id,
+            "title": row.title,
+            "description": row.description,
+            "file_url": row.file_url,
+            "file_type": row.file_type,
+            "creator_name": row.creator_name or row.username,
+            "price": row.price,
+            "views": row.views,
+            "created_at": row.created_at,
+            "expires_at": row.expires_at
+        }
+        for row in result
     ]
+    content_list_cache[cache_key] = response
+    return response
+
+@app.post("/api/content/presign", response_model=PresignResponse)
+async def presign_upload(
+    request: PresignRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Generate a presigned PUT URL so the client uploads directly to S3"""
+    if not current_user.is_creator:
+        raise HTTPException(status_code=403, detail="Only creators can upload content")
+
+    # Validate file type
+    if request.content_type not in ALLOWED_UPLOAD_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported file type")
+
+    # Generate unique key
+    key = make_upload_key(request.filename)
+
+    url = s3_client.generate_presigned_url(
+        "put_object",
+        Params={
+            "Bucket": settings.S3_BUCKET,
+            "Key": key,
+            "ContentType": request.content_type
+        },
+        ExpiresIn=900
+    )
+
+    return PresignResponse(url=url, key=key)
 
 @app.post("/api/content", response_model=ContentResponse)
 async def create_content(
     title: str = Form(...),
     description: str = Form(...),
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    s3_key: Optional[str] = Form(None),
+    content_type: Optional[str] = Form(None),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     if not current_user.is_creator:
         raise HTTPException(status_code=403, detail="Only creators can upload content")
-    
-    # Validate file type
-    allowed_types = {'audio/mpeg', 'audio/wav', 'video/mp4', 'video/quicktime', 'video/x-msvideo'}
-    if file.content_type not in allowed_types:
-        raise HTTPException(status_code=400, detail="Unsupported file type")
-    
-    # Generate unique filename
-    file_extension = file.filename.split('.')[-1]
-    filename = f"{uuid.uuid4()}.{file_extension}"
-    
-    # Upload to S3
-    file_url = await upload_to_s3(file, filename)
-    
+
+    if s3_key:
+        # File was already uploaded directly to S3 via a presigned URL;
+        # only accept keys shaped like the ones presign_upload hands out
+        if not UPLOAD_KEY_PATTERN.fullmatch(s3_key):
+            raise HTTPException(status_code=400, detail="Invalid s3_key")
+        if content_type not in ALLOWED_UPLOAD_TYPES:
+            raise HTTPException(status_code=400, detail="Unsupported file type")
+        file_url = f"https://{settings.S3_BUCKET}.s3.amazonaws.com/{s3_key}"
+        file_size = None
+    elif file:
+        # Legacy path: proxy the upload through the backend
+        if file.content_type not in ALLOWED_UPLOAD_TYPES:
+            raise HTTPException(status_code=400, detail="Unsupported file type")
+
+        # Generate unique filename
+        filename = make_upload_key(file.filename)
+
+        # Upload to S3
+        file_url = await upload_to_s3(file, filename)
+        content_type = file.content_type
+        file_size = file.size
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide either a file or an s3_key from /api/content/presign"
+        )
+
     # Determine file type
-    file_type = 'audio' if file.content_type.startswith('audio') else 'video'
-    
+    file_type = 'audio' if content_type in ALLOWED_AUDIO_TYPES else 'video'
+
     # Create content record
     content = Content(
         title=title,
         description=description,
         file_url=file_url,
         file_type=file_type,
-        file_size=file.size,
+        file_size=file_size,
         creator_id=current_user.id,
         price=settings.CONTENT_PRICE
     )
@@ -268,7 +417,10 @@ async def create_content(
     db.add(content)
     await db.commit()
     await db.refresh(content)
-    
+
+    # New content changes the public listing
+    content_list_cache.clear()
+
     return ContentResponse(
         id=content.id,
         title=content.title,
@@ -282,30 +434,48 @@ async def create_content(
         expires_at=content.expires_at
     )
 
-@app.get("/api/content/{content_id}", response_model=ContentResponse)
-async def get_content_by_id(content_id: str, db: AsyncSession = Depends(get_db)):
+@app.get("/api/content/{content_id}", response_model=None)
+async def get_content_by_id(content_id: str, db: AsyncSession = Depends(get_db)) -> dict:
+    cached = content_detail_cache.get(content_id)
+    if cached is not None:
+        return cached
+
     result = await db.execute(
-        select(Content)
-        .options(selectinload(Content.creator))
+        select(
+            Content.id,
+            Content.title,
+            Content.description,
+            Content.file_url,
+            Content.file_type,
+            Content.price,
+            Content.views,
+            Content.created_at,
+            Content.expires_at,
+            User.creator_name,
+            User.username
+        )
+        .join(User, User.id == Content.creator_id)
         .where(and_(Content.id == content_id, Content.is_active == True))
     )
-    content = result.scalar_one_or_none()
-    
-    if not content:
+    row = result.one_or_none()
+
+    if not row:
         raise HTTPException(status_code=404, detail="Content not found")
-    
-    return ContentResponse(
-        id=content.id,
-        title=content.title,
-        description=content.description,
-        file_url=content.file_url,
-        file_type=content.file_type,
-        creator_name=content.creator.creator_name or content.creator.username,
-        price=content.price,
-        views=content.views,
-        created_at=content.created_at,
-        expires_at=content.expires_at
-    )
+
+    response = {
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "file_url": row.file_url,
+        "file_type": row.file_type,
+        "creator_name": row.creator_name or row.username,
+        "price": row.price,
+        "views": row.views,
+        "created_at": row.created_at,
+        "expires_at": row.expires_at
+    }
+    content_detail_cache[content_id] = response
+    return response
 
 # Payment endpoints
 @app.post("/api/payments/initiate")
@@ -314,26 +484,38 @@ async def initiate_payment(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    # Check if content exists
-    result = await db.execute(select(Content).where(Content.id == payment_data.content_id))
-    content = result.scalar_one_or_none()
-    
+    # The content lookup and duplicate-payment check are independent, so run
+    # them concurrently on their own sessions (an AsyncSession only supports
+    # one statement at a time)
+    async def _get_content():
+        async with async_session() as session:
+            result = await session.execute(
+                select(Content).where(Content.id == payment_data.content_id)
+            )
+            return result.scalar_one_or_none()
+
+    async def _already_paid():
+        # EXISTS returns a bare boolean without materializing a Payment row
+        async with async_session() as session:
+            result = await session.execute(
+                select(
+                    exists().where(
+                        and_(
+                            Payment.user_id == current_user.id,
+                            Payment.content_id == payment_data.content_id,
+                            Payment.status == 'completed'
+                        )
+                    )
+                )
+            )
+            return result.scalar()
+
+    content, already_paid = await asyncio.gather(_get_content(), _already_paid())
+
     if not content:
         raise HTTPException(status_code=404, detail="Content not found")
-    
-    # Check if user already paid for this content
-    result = await db.execute(
-        select(Payment).where(
-            and_(
-                Payment.user_id == current_user.id,
-                Payment.content_id == payment_data.content_id,
-                Payment.status == 'completed'
-            )
-        )
-    )
-    existing_payment = result.scalar_one_or_none()
-    
-    if existing_payment:
+
+    if already_paid:
         raise HTTPException(status_code=400, detail="You have already paid for this content")
     
     # Process payment with Payway
@@ -362,59 +544,84 @@ async def initiate_payment(
 async def payment_callback(callback_data: dict, db: AsyncSession = Depends(get_db)):
     """Handle Payway payment callback"""
     transaction_id = callback_data.get('transaction_id')
-    status = callback_data.get('status')
-    
-    result = await db.execute(
-        select(Payment).where(Payment.payway_transaction_id == transaction_id)
-    )
-    payment = result.scalar_one_or_none()
-    
-    if not payment:
-        raise HTTPException(status_code=404, detail="Payment not found")
-    
-    if status == 'completed':
-        payment.status = 'completed'
-        payment.completed_at = datetime.utcnow()
-        
-        # Increment content views
-        result = await db.execute(select(Content).where(Content.id == payment.content_id))
-        content = result.scalar_one_or_none()
-        if content:
-            content.paid_views += 1
-    
-    elif status == 'failed':
-        payment.status = 'failed'
-    
+    payment_status = callback_data.get('status')
+
+    if payment_status == 'completed':
+        # Single UPDATE ... RETURNING; the status guard keeps retried
+        # callbacks from double-counting paid views
+        result = await db.execute(
+            update(Payment)
+            .where(
+                and_(
+                    Payment.payway_transaction_id == transaction_id,
+                    Payment.status != 'completed'
+                )
+            )
+            .values(status='completed', completed_at=datetime.utcnow())
+            .returning(Payment.content_id)
+        )
+        content_id = result.scalar_one_or_none()
+
+        if content_id:
+            await db.execute(
+                update(Content)
+                .where(Content.id == content_id)
+                .values(paid_views=Content.paid_views + 1)
+            )
+        else:
+            # Either an unknown transaction or a repeat callback;
+            # only the former is an error
+            result = await db.execute(
+                select(exists().where(Payment.payway_transaction_id == transaction_id))
+            )
+            if not result.scalar():
+                raise HTTPException(status_code=404, detail="Payment not found")
+
+    elif payment_status == 'failed':
+        result = await db.execute(
+            update(Payment)
+            .where(Payment.payway_transaction_id == transaction_id)
+            .values(status='failed')
+        )
+        if result.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Payment not found")
+
     await db.commit()
     return {"message": "Payment status updated"}
 
 # Dashboard endpoints
 @app.get("/api/dashboard/creator")
 async def get_creator_dashboard(
+    skip: int = 0,
+    limit: int = 50,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     if not current_user.is_creator:
         raise HTTPException(status_code=403, detail="Access denied")
-    
-    # Get creator's content
+
+    # Content count and total unpaid earnings in one aggregate query
+    count_query = select(func.count(Content.id)).where(
+        and_(Content.creator_id == current_user.id, Content.is_active == True)
+    ).scalar_subquery()
+    earnings_query = select(func.coalesce(func.sum(Earnings.amount), 0)).where(
+        and_(Earnings.creator_id == current_user.id, Earnings.paid_out == False)
+    ).scalar_subquery()
+    result = await db.execute(select(count_query, earnings_query))
+    content_count, total_earnings = result.one()
+
+    # Get a page of creator's content
     result = await db.execute(
-        select(Content).where(
-            and_(Content.creator_id == current_user.id, Content.is_active == True)
-        )
+        select(Content)
+        .where(and_(Content.creator_id == current_user.id, Content.is_active == True))
+        .order_by(Content.created_at.desc())
+        .offset(skip)
+        .limit(limit)
     )
     content_items = result.scalars().all()
-    
-    # Calculate total earnings (unpaid)
-    result = await db.execute(
-        select(func.sum(Earnings.amount)).where(
-            and_(Earnings.creator_id == current_user.id, Earnings.paid_out == False)
-        )
-    )
-    total_earnings = result.scalar() or 0
-    
+
     return {
-        "content_count": len(content_items),
+        "content_count": content_count,
         "total_earnings": float(total_earnings),
         "content_items": [
             {
@@ -431,10 +638,26 @@ async def get_creator_dashboard(
 
 @app.get("/api/dashboard/user")
 async def get_user_dashboard(
+    skip: int = 0,
+    limit: int = 50,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    # Get user's purchased content
+    # Count purchases server-side instead of materializing every row
+    result = await db.execute(
+        select(func.count())
+        .select_from(Content)
+        .join(Payment)
+        .where(
+            and_(
+                Payment.user_id == current_user.id,
+                Payment.status == 'completed'
+            )
+        )
+    )
+    purchased_count = result.scalar()
+
+    # Get a page of user's purchased content
     result = await db.execute(
         select(Content)
         .join(Payment)
@@ -445,11 +668,14 @@ async def get_user_dashboard(
                 Payment.status == 'completed'
             )
         )
+        .order_by(Content.created_at.desc())
+        .offset(skip)
+        .limit(limit)
     )
     purchased_content = result.scalars().all()
-    
+
     return {
-        "purchased_count": len(purchased_content),
+        "purchased_count": purchased_count,
         "purchased_content": [
             {
                 "id": item.id,
@@ -473,11 +699,18 @@ async def get_weekly_earnings(
     # For now, this is open - in production you'd want admin authentication
     
     week_end = week_start + timedelta(days=6)
-    
-    # Get all earnings for the specified week
+
+    # Aggregate per creator in the database instead of per-row in Python
     result = await db.execute(
-        select(Earnings)
-        .options(selectinload(Earnings.creator))
+        select(
+            Earnings.creator_id,
+            User.creator_name,
+            User.username,
+            User.phone_number,
+            func.sum(Earnings.amount).label('total_amount'),
+            func.count().label('content_count')
+        )
+        .join(User, User.id == Earnings.creator_id)
         .where(
             and_(
                 Earnings.week_start == week_start,
@@ -485,24 +718,18 @@ async def get_weekly_earnings(
                 Earnings.paid_out == False
             )
         )
+        .group_by(Earnings.creator_id)
     )
-    earnings = result.scalars().all()
-    
-    # Group by creator
-    creator_earnings = {}
-    for earning in earnings:
-        creator_id = earning.creator_id
-        if creator_id not in creator_earnings:
-            creator_earnings[creator_id] = {
-                'creator_name': earning.creator.creator_name or earning.creator.username,
-                'phone_number': earning.creator.phone_number,
-                'total_amount': 0,
-                'content_count': 0
-            }
-        creator_earnings[creator_id]['total_amount'] += earning.amount
-        creator_earnings[creator_id]['content_count'] += 1
-    
-    return creator_earnings
+
+    return {
+        row.creator_id: {
+            'creator_name': row.creator_name or row.username,
+            'phone_number': row.phone_number,
+            'total_amount': row.total_amount,
+            'content_count': row.content_count
+        }
+        for row in result
+    }
 
 @app.get("/api/admin/export-earnings")
 async def export_weekly_earnings(
@@ -542,16 +769,18 @@ async def export_weekly_earnings(
         })
     
     df = pd.DataFrame(data)
-    
-    # Create Excel file
+
+    # Serialize to an in-memory buffer in a worker thread; to_excel is a
+    # blocking call that would otherwise stall the event loop
     filename = f"earnings_{week_start}_to_{week_end}.xlsx"
-    filepath = f"/tmp/{filename}"
-    df.to_excel(filepath, index=False)
-    
-    return FileResponse(
-        filepath,
-        filename=filename,
-        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    buffer = BytesIO()
+    await asyncio.to_thread(df.to_excel, buffer, index=False)
+    buffer.seek(0)
+
+    return StreamingResponse(
+        buffer,
+        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Date, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Date, Text, ForeignKey, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime, timedelta
 import uuid
 
+from config import settings
+
 Base = declarative_base()
 
 class User(Base):
@@ -14,7 +16,7 @@ class User(Base):
     email = Column(String(120), unique=True, index=True, nullable=False)
     password_hash = Column(String(200), nullable=False)
     is_creator = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
     
     # Creator profile fields
     creator_name = Column(String(100))
@@ -39,8 +41,12 @@ class Content(Base):
     price = Column(Float, default=5.0)  # KSH 5
     views = Column(Integer, default=0)
     paid_views = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    expires_at = Column(DateTime, default=lambda: datetime.utcnow() + timedelta(days=14))
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
+    expires_at = Column(
+        DateTime,
+        default=lambda: datetime.utcnow() + timedelta(days=settings.CONTENT_EXPIRY_DAYS),
+        index=True  # scanned nightly by cleanup_expired_content
+    )
     is_active = Column(Boolean, default=True)
     
     # Relationships
@@ -48,6 +54,12 @@ class Content(Base):
     payments = relationship("Payment", back_populates="content")
     earnings = relationship("Earnings", back_populates="content")
 
+    # Composite indexes for the content listing and creator dashboard
+    __table_args__ = (
+        Index("ix_content_active_created", "is_active", "created_at"),
+        Index("ix_content_creator_active", "creator_id", "is_active"),
+    )
+
 class Payment(Base):
     __tablename__ = "payments"
     
@@ -55,15 +67,20 @@ class Payment(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     content_id = Column(String(36), ForeignKey("content.id"), nullable=False)
     amount = Column(Float, nullable=False)
-    payway_transaction_id = Column(String(100))
+    payway_transaction_id = Column(String(100), index=True)
     status = Column(String(20), default='pending')  # pending, completed, failed
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
     completed_at = Column(DateTime)
-    
+
     # Relationships
     user = relationship("User", back_populates="payments")
     content = relationship("Content", back_populates="payments")
 
+    # Composite index for the duplicate-payment check
+    __table_args__ = (
+        Index("ix_payment_user_content_status", "user_id", "content_id", "status"),
+    )
+
 class Earnings(Base):
     __tablename__ = "earnings"
     
@@ -74,8 +91,14 @@ class Earnings(Base):
     week_start = Column(Date, nullable=False)
     week_end = Column(Date, nullable=False)
     paid_out = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
     
     # Relationships
     creator = relationship("User", back_populates="earnings")
     content = relationship("Content", back_populates="earnings")
+
+    # Composite indexes for the dashboard earnings sum and weekly admin reports
+    __table_args__ = (
+        Index("ix_earnings_creator_paid_out", "creator_id", "paid_out"),
+        Index("ix_earnings_week", "week_start", "week_end", "paid_out"),
+    )
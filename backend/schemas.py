@@ -37,6 +37,14 @@ class ContentUpload(BaseModel):
     description: Optional[str]
     file_type: str
 
+class PresignRequest(BaseModel):
+    filename: str
+    content_type: str
+
+class PresignResponse(BaseModel):
+    url: str
+    key: str
+
 class ContentResponse(BaseModel):
     id: str
     title: str
@@ -71,10 +71,26 @@ export const contentAPI = {
   },
 
   createContent: async (contentData) => {
+    // Get a presigned URL and PUT the file straight to S3 so the backend
+    // never proxies the file bytes
+    const presignResponse = await api.post('/api/content/presign', {
+      filename: contentData.file.name,
+      content_type: contentData.file.type,
+    });
+    const { url, key } = presignResponse.data;
+
+    // Plain axios here: S3 rejects presigned PUTs carrying our auth header
+    await axios.put(url, contentData.file, {
+      headers: {
+        'Content-Type': contentData.file.type,
+      },
+    });
+
     const formData = new FormData();
     formData.append('title', contentData.title);
     formData.append('description', contentData.description);
-    formData.append('file', contentData.file);
+    formData.append('s3_key', key);
+    formData.append('content_type', contentData.file.type);
 
     const response = await api.post('/api/content', formData, {
       headers: {
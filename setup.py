@@ -4,73 +4,29 @@ ContentHub Setup Script
 Automates the setup process for the content platform
 """
 
+import importlib
 import os
 import sys
+import shutil
 import subprocess
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def run_command(command, cwd=None, check=True):
-    """Run a command and return the result"""
-    print(f"Running: {command}")
-    try:
-        result = subprocess.run(
-            command, 
-            shell=True, 
-            cwd=cwd, 
-            check=check,
-            capture_output=True,
-            text=True
-        )
-        if result.stdout:
-            print(result.stdout)
-        return result
-    except subprocess.CalledProcessError as e:
-        print(f"Error running command: {e}")
-        if e.stderr:
-            print(f"Error output: {e.stderr}")
-        return None
+# Platform facts and venv paths, computed once at import
+IS_WINDOWS = sys.platform == "win32"
+PYTHON_CMD = "python" if IS_WINDOWS else "python3"
+BACKEND_DIR = Path("backend")
+FRONTEND_DIR = Path("frontend")
+# Absolute paths: without a shell, Windows resolves relative executables
+# against the parent's directory rather than the subprocess cwd
+VENV_BIN = (BACKEND_DIR / "venv" / ("Scripts" if IS_WINDOWS else "bin")).resolve()
+VENV_PYTHON = str(VENV_BIN / ("python.exe" if IS_WINDOWS else "python"))
+VENV_PIP = str(VENV_BIN / ("pip.exe" if IS_WINDOWS else "pip"))
 
-def setup_backend():
-    """Set up the FastAPI backend"""
-    print("\n🔧 Setting up Backend...")
-    
-    backend_dir = Path("backend")
-    
-    # Check if Python is installed
-    python_cmd = "python" if sys.platform == "win32" else "python3"
-    
-    # Create virtual environment
-    print("Creating virtual environment...")
-    venv_cmd = f"{python_cmd} -m venv venv"
-    run_command(venv_cmd, cwd=backend_dir)
-    
-    # Determine activation command
-    if sys.platform == "win32":
-        activate_cmd = "venv\\Scripts\\activate"
-        pip_cmd = "venv\\Scripts\\pip"
-    else:
-        activate_cmd = "source venv/bin/activate"
-        pip_cmd = "venv/bin/pip"
-    
-    # Install dependencies
-    print("Installing Python dependencies...")
-    install_cmd = f"{pip_cmd} install -r requirements.txt"
-    run_command(install_cmd, cwd=backend_dir)
-    
-    # Create .env file if it doesn't exist
-    env_file = backend_dir / ".env"
-    env_example = backend_dir / ".env.example"
-    
-    if not env_file.exists():
-        if env_example.exists():
-            print("Creating .env file from example...")
-            with open(env_example, 'r') as src, open(env_file, 'w') as dst:
-                dst.write(src.read())
-        else:
-            print("Creating basic .env file...")
-            with open(env_file, 'w') as f:
-                f.write("""# ContentHub Configuration
+# Default backend/.env contents, written when no .env.example exists.
+# Stored as bytes so the write is a single syscall with no encode pass.
+DEFAULT_ENV_BYTES = b"""# ContentHub Configuration
 SECRET_KEY=change-this-secret-key-in-production
 DATABASE_URL=sqlite+aiosqlite:///./content_platform.db
 BASE_URL=http://localhost:8000
@@ -89,58 +45,10 @@ PAYWAY_API_KEY=your-payway-api-key
 CONTENT_PRICE=5.0
 PLATFORM_COMMISSION=0.5
 CONTENT_EXPIRY_DAYS=14
-""")
-    
-    print("✅ Backend setup complete!")
-    print(f"📝 Please edit {env_file} with your actual configuration")
-
-def setup_frontend():
-    """Set up the React frontend"""
-    print("\n🎨 Setting up Frontend...")
-    
-    frontend_dir = Path("frontend")
-    
-    # Check if Node.js is installed
-    node_check = run_command("node --version", check=False)
-    if not node_check:
-        print("❌ Node.js not found. Please install Node.js 16+ first.")
-        return False
-    
-    # Install dependencies
-    print("Installing Node.js dependencies...")
-    run_command("npm install", cwd=frontend_dir)
-    
-    print("✅ Frontend setup complete!")
-    return True
-
-async def init_database():
-    """Initialize the database"""
-    print("\n🗄️  Initializing database...")
-    
-    try:
-        # Add backend to Python path
-        sys.path.append(str(Path("backend").absolute()))
-        
-        # Import and create tables
-        from backend.models import Base
-        from backend.database import engine
-        
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        
-        print("✅ Database initialized successfully!")
-        
-    except Exception as e:
-        print(f"❌ Database initialization failed: {e}")
-        print("You may need to run this manually after setting up the backend.")
+"""
 
-def create_start_scripts():
-    """Create convenient start scripts"""
-    print("\n📜 Creating start scripts...")
-    
-    # Windows batch file
-    with open("start-dev.bat", "w") as f:
-        f.write("""@echo off
+# Start scripts emitted by create_start_scripts
+WINDOWS_START_BAT = """@echo off
 echo Starting ContentHub Development Environment...
 echo.
 
@@ -159,11 +67,9 @@ echo Frontend: http://localhost:3000
 echo API Docs: http://localhost:8000/docs
 echo.
 pause
-""")
-    
-    # Unix shell script
-    with open("start-dev.sh", "w") as f:
-        f.write("""#!/bin/bash
+"""
+
+UNIX_START_SH = """#!/bin/bash
 echo "Starting ContentHub Development Environment..."
 echo
 
@@ -202,58 +108,247 @@ echo "Press Ctrl+C to stop all services"
 # Wait for interrupt
 trap 'echo "Stopping services..."; kill $BACKEND_PID $FRONTEND_PID 2>/dev/null; exit' INT
 wait
-""")
-    
-    # Make shell script executable
-    if sys.platform != "win32":
-        run_command("chmod +x start-dev.sh")
+"""
+
+def run_command(command, cwd=None, check=True, capture=False):
+    """Run a command (given as an argument list) and return the result.
+
+    Output streams to the terminal by default so long installs show live
+    progress; pass capture=True for short probes whose output is parsed.
+    Every remaining caller is a long-running install, so subprocess.run's
+    per-spawn overhead is negligible next to the child's own runtime.
+    """
+    print(f"Running: {' '.join(command)}")
+    try:
+        result = subprocess.run(
+            command,
+            cwd=cwd,
+            check=check,
+            capture_output=capture,
+            text=True
+        )
+        if capture and result.stdout:
+            print(result.stdout)
+        return result
+    except FileNotFoundError:
+        print(f"Error running command: {command[0]} not found")
+        return None
+    except subprocess.CalledProcessError as e:
+        print(f"Error running command: {e}")
+        if e.stderr:
+            print(f"Error output: {e.stderr}")
+        return None
+
+def _write_raw(path, data, mode=0o644):
+    """Atomically write a file: one os.write to a temp file, fsync, rename.
+
+    A crash mid-setup can never leave a torn half-written file behind;
+    readers see either the old contents or the new ones.
+    """
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+def setup_backend():
+    """Set up the FastAPI backend"""
+    print("\n🔧 Setting up Backend...")
+
+    uv_cmd = shutil.which("uv")
+    virtualenv_cmd = shutil.which("virtualenv")
+
+    # Create virtual environment; virtualenv seeds pip from cached wheels
+    # and skips the slow ensurepip bootstrap that python -m venv runs
+    print("Creating virtual environment...")
+    if virtualenv_cmd:
+        run_command([virtualenv_cmd, "venv"], cwd=BACKEND_DIR)
+    elif uv_cmd:
+        # uv installs straight into the venv, so it doesn't need pip seeded
+        run_command([PYTHON_CMD, "-m", "venv", "--without-pip", "venv"], cwd=BACKEND_DIR)
+    else:
+        run_command([PYTHON_CMD, "-m", "venv", "venv"], cwd=BACKEND_DIR)
+
+    # Install dependencies; prefer uv, which resolves and installs in
+    # parallel and is much faster than pip on cold caches
+    print("Installing Python dependencies...")
+    if uv_cmd:
+        install_cmd = [uv_cmd, "pip", "install", "--python", VENV_PYTHON, "-r", "requirements.txt"]
+    else:
+        install_cmd = [VENV_PIP, "install", "-r", "requirements.txt"]
+    run_command(install_cmd, cwd=BACKEND_DIR)
+
+    print("✅ Backend setup complete!")
+
+def create_env_file():
+    """Create backend/.env if it doesn't exist"""
+    env_file = BACKEND_DIR / ".env"
+    env_example = BACKEND_DIR / ".env.example"
+
+    if not env_file.exists():
+        if env_example.exists():
+            print("Creating .env file from example...")
+            # Byte-for-byte copy: one read, one atomic write, no decode/encode
+            _write_raw(str(env_file), env_example.read_bytes())
+        else:
+            print("Creating basic .env file...")
+            _write_raw(str(env_file), DEFAULT_ENV_BYTES)
+
+    print(f"📝 Please edit {env_file} with your actual configuration")
+
+def check_node():
+    """Check that Node.js is installed"""
+    # A PATH lookup is enough here; no need to spawn node just to see
+    # whether it exists
+    if not shutil.which("node"):
+        print("❌ Node.js not found. Please install Node.js 16+ first.")
+        return False
+    return True
+
+def setup_frontend():
+    """Set up the React frontend"""
+    print("\n🎨 Setting up Frontend...")
+
+    # Install dependencies; resolve npm's full path since on Windows it's
+    # a .cmd shim that only a shell would find
+    print("Installing Node.js dependencies...")
+    npm_cmd = shutil.which("npm") or "npm"
+    # npm ci installs straight from the lockfile, skipping resolution;
+    # --no-audit/--no-fund drop npm's extra network round trips
+    if (FRONTEND_DIR / "package-lock.json").exists():
+        install_cmd = [npm_cmd, "ci", "--no-audit", "--no-fund", "--prefer-offline"]
+    else:
+        install_cmd = [npm_cmd, "install", "--no-audit", "--no-fund", "--prefer-offline"]
+    run_command(install_cmd, cwd=FRONTEND_DIR)
+
+    print("✅ Frontend setup complete!")
+
+async def init_database():
+    """Initialize the database"""
+    print("\n🗄️  Initializing database...")
     
-    print("✅ Start scripts created!")
-    print("  - Windows: start-dev.bat")
-    print("  - Unix/Mac: ./start-dev.sh")
+    try:
+        # Put backend/ at the front of sys.path exactly once; the backend
+        # modules import each other by bare name ("from config import
+        # settings"), so the directory itself must be importable. The guard
+        # keeps repeat calls from mutating the path and re-invalidating the
+        # importer caches.
+        backend_path = str(BACKEND_DIR.resolve())
+        if backend_path not in sys.path:
+            sys.path.insert(0, backend_path)
+            importlib.invalidate_caches()
+
+        # Import and create tables
+        from models import Base
+        from database import engine
+
+        from sqlalchemy.schema import CreateTable, CreateIndex
+
+        if engine.dialect.name == "sqlite":
+            # Compile every CREATE statement up front and run them as one
+            # script, so aiosqlite makes a single round trip instead of one
+            # await per table and index
+            statements = []
+            for table in Base.metadata.sorted_tables:
+                statements.append(
+                    str(CreateTable(table, if_not_exists=True).compile(dialect=engine.dialect))
+                )
+                statements.extend(
+                    str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect))
+                    for index in table.indexes
+                )
+            ddl = "BEGIN;\n" + ";\n".join(statements) + ";\nCOMMIT;"
+            async with engine.connect() as conn:
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.executescript(ddl)
+        else:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+        print("✅ Database initialized successfully!")
+        
+    except Exception as e:
+        print(f"❌ Database initialization failed: {e}")
+        print("You may need to run this manually after setting up the backend.")
+
+def create_start_scripts():
+    """Create convenient start scripts"""
+    print("\n📜 Creating start scripts...")
+
+    # The scripts are independent files, so write each with one raw
+    # os.write on its own worker and let the writes overlap
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        bat_future = executor.submit(_write_raw, "start-dev.bat", WINDOWS_START_BAT.encode())
+        sh_future = executor.submit(_write_raw, "start-dev.sh", UNIX_START_SH.encode(), 0o755)
+        bat_future.result()
+        sh_future.result()
+
+    # O_CREAT's mode is umask-filtered and skipped for existing files,
+    # so pin the executable bit explicitly
+    if not IS_WINDOWS:
+        os.chmod("start-dev.sh", 0o755)
+
+    # One write for the whole status block instead of a flush per line
+    print("✅ Start scripts created!\n"
+          "  - Windows: start-dev.bat\n"
+          "  - Unix/Mac: ./start-dev.sh")
 
 def main():
     """Main setup function"""
-    print("🚀 ContentHub Setup")
-    print("==================")
-    print("This script will set up the development environment for ContentHub.")
-    print()
+    print("🚀 ContentHub Setup\n"
+          "==================\n"
+          "This script will set up the development environment for ContentHub.\n")
     
     # Check current directory
-    if not (Path("backend").exists() and Path("frontend").exists()):
+    if not (BACKEND_DIR.exists() and FRONTEND_DIR.exists()):
         print("❌ Please run this script from the project root directory.")
         print("Expected structure: backend/ and frontend/ directories")
         sys.exit(1)
     
     try:
-        # Setup backend
-        setup_backend()
-        
-        # Setup frontend
-        frontend_ok = setup_frontend()
-        
-        if frontend_ok:
-            # Initialize database
-            asyncio.run(init_database())
-            
-            # Create start scripts
-            create_start_scripts()
-            
-            print("\n🎉 Setup Complete!")
-            print("==================")
-            print()
-            print("Next steps:")
-            print("1. Edit backend/.env with your AWS S3 and Payway credentials")
-            print("2. Run the development environment:")
-            if sys.platform == "win32":
-                print("   - Windows: start-dev.bat")
-            else:
-                print("   - Unix/Mac: ./start-dev.sh")
-            print("3. Visit http://localhost:3000 to use the application")
-            print("4. Check http://localhost:8000/docs for API documentation")
-            print()
-            print("Happy creating! 🎨✨")
-        
+        # Fail fast on missing Node before kicking off any long installs
+        if not check_node():
+            sys.exit(1)
+
+        # Create .env in the main thread so it can't race the installs
+        create_env_file()
+
+        # The pip and npm installs are independent, so run them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            backend_future = executor.submit(setup_backend)
+            frontend_future = executor.submit(setup_frontend)
+
+            # Database init only needs the backend deps, so start it as soon
+            # as they're installed and overlap it with the (usually longer)
+            # npm install
+            backend_future.result()
+            db_future = executor.submit(lambda: asyncio.run(init_database()))
+
+            db_future.result()
+            frontend_future.result()
+
+        # Create start scripts
+        create_start_scripts()
+
+        # Emit the closing banner as a single write
+        summary = [
+            "\n🎉 Setup Complete!",
+            "==================",
+            "",
+            "Next steps:",
+            "1. Edit backend/.env with your AWS S3 and Payway credentials",
+            "2. Run the development environment:",
+            "   - Windows: start-dev.bat" if IS_WINDOWS else "   - Unix/Mac: ./start-dev.sh",
+            "3. Visit http://localhost:3000 to use the application",
+            "4. Check http://localhost:8000/docs for API documentation",
+            "",
+            "Happy creating! 🎨✨",
+        ]
+        sys.stdout.write("\n".join(summary) + "\n")
+
     except KeyboardInterrupt:
         print("\n❌ Setup interrupted by user")
         sys.exit(1)